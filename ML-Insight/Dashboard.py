@@ -15,8 +15,11 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
-from wordcloud import WordCloud
+from plotly.subplots import make_subplots
+from wordcloud import WordCloud, STOPWORDS
 import json
+import re
+from collections import Counter
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -26,14 +29,21 @@ try:
 except ImportError:
     st = None
 
+# Optional: orjson for faster JSON parsing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # %% [markdown]
 # ## 2. Load Survey Responses from JSON
 # We will load the survey responses from the JSON file (`survey-results.json`).
 
 # %%
 # Load the survey data from JSON file
-with open('survey-results-f5ae24e1-9985-450b-b36c-878ffa7f471d.json', 'r', encoding='utf-8') as f:
-    survey_data = json.load(f)
+with open('survey-results-f5ae24e1-9985-450b-b36c-878ffa7f471d.json', 'rb') as f:
+    raw = f.read()
+survey_data = orjson.loads(raw) if orjson else json.loads(raw)
 
 def extract_records(survey_data):
     if isinstance(survey_data, dict):
@@ -50,6 +60,37 @@ def extract_records(survey_data):
     return pd.DataFrame(records)
 
 df = extract_records(survey_data)
+# Parse every date/timestamp column once up front instead of per section
+date_cols = [col for col in df.columns if 'date' in col.lower() or 'timestamp' in col.lower()]
+# Share of non-null values that must parse for a date column (or for the ISO 8601 fast path)
+DATE_PARSE_MIN_RATIO = 0.9
+
+def parse_dates(series):
+    # Try the ISO 8601 fast path first; fall back to format inference only if it misses a real share of values
+    parsed = pd.to_datetime(series, errors='coerce', utc=True, format='ISO8601')
+    if parsed.notna().sum() < DATE_PARSE_MIN_RATIO * series.notna().sum():
+        parsed = pd.to_datetime(series, errors='coerce', utc=True)
+    return parsed
+
+def parse_date_cols(df, date_cols):
+    # Question columns can match by name too ("How often would you like updates?"),
+    # so only keep the columns whose values actually parse as dates
+    parsed = {}
+    for col in date_cols:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        try:
+            dates = parse_dates(df[col])
+        except (TypeError, ValueError):
+            continue
+        n_valid = df[col].notna().sum()
+        if n_valid and dates.notna().sum() >= DATE_PARSE_MIN_RATIO * n_valid:
+            parsed[col] = dates
+    return parsed
+
+parsed_dates = parse_date_cols(df, date_cols)
+date_cols = list(parsed_dates)
+df = df.assign(**parsed_dates).copy()
 if st:
     st.write('Columns:', df.columns.tolist())
     st.dataframe(df.head())
@@ -68,6 +109,14 @@ if st:
 else:
     print('Total responses:', len(df))
 
+def prebinned_histogram(values, nbins=20, title=None):
+    # Bin on the server so only the bin counts are sent to the browser
+    values = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy()
+    counts, edges = np.histogram(values, bins=nbins)
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+    fig.update_layout(title=title, yaxis_title='count', bargap=0)
+    return fig
+
 # Completion time distribution (if available)
 time_col = None
 for col in df.columns:
@@ -77,7 +126,7 @@ for col in df.columns:
 if time_col:
     if st:
         import plotly.express as px
-        st.plotly_chart(px.histogram(df, x=time_col, nbins=20, title='Completion Time Distribution'))
+        st.plotly_chart(prebinned_histogram(df[time_col], nbins=20, title='Completion Time Distribution'))
     else:
         plt.figure(figsize=(6, 4))
         sns.histplot(df[time_col].dropna(), bins=20, kde=True)
@@ -89,13 +138,8 @@ else:
     print('No completion time column found.')
 
 # Response count per day (if timestamp available)
-date_col = None
-for col in df.columns:
-    if 'date' in col.lower() or 'timestamp' in col.lower():
-        date_col = col
-        break
+date_col = date_cols[0] if date_cols else None
 if date_col:
-    df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
     daily_counts = df[date_col].dt.date.value_counts().sort_index()
     if st:
         st.bar_chart(daily_counts)
@@ -115,35 +159,52 @@ else:
 
 # %%
 # Bar charts for MCQ answers
-from pandas.api.types import is_object_dtype
-mcq_cols = []
-for col in df.columns:
-    try:
-        if is_object_dtype(df[col]):
-            nunique = df[col].dropna().nunique()
-            if 2 <= nunique < 20:
+try:
+    nunique = df.select_dtypes(include='object').nunique(dropna=True)
+    mcq_cols = nunique[(nunique >= 2) & (nunique < 20)].index.tolist()
+except TypeError:
+    # Unhashable answers (e.g. lists) can't be counted in one pass; check per column
+    mcq_cols = []
+    for col in df.select_dtypes(include='object').columns:
+        try:
+            if 2 <= df[col].nunique() < 20:
                 mcq_cols.append(col)
-    except Exception:
-        continue
-for col in mcq_cols:
+        except TypeError:
+            continue
+def mcq_bar_grid(mcq_counts, ncols=3):
+    # One subplot grid for every MCQ question: a single figure to serialize and render
+    nrows = (len(mcq_counts) + ncols - 1) // ncols
+    fig = make_subplots(rows=nrows, cols=ncols, subplot_titles=list(mcq_counts))
+    for i, (col, vc) in enumerate(mcq_counts.items()):
+        fig.add_bar(x=vc.index.astype(str), y=vc.values, name=col, row=i // ncols + 1, col=i % ncols + 1)
+    fig.update_layout(height=350 * nrows, showlegend=False)
+    return fig
+
+mcq_counts = {col: df[col].value_counts(dropna=False) for col in mcq_cols}
+if mcq_cols:
     try:
-        vc = df[col].value_counts(dropna=False).reset_index()
-        vc.columns = [col, 'Count']
-        fig = px.bar(vc, x=col, y='Count', title=f'Bar Chart: {col}')
+        fig = mcq_bar_grid(mcq_counts)
         if st:
-            st.plotly_chart(fig, key=f"plotly_chart_{col}")
+            st.plotly_chart(fig, key="plotly_chart_mcq_bars")
         else:
             fig.show()
     except Exception as e:
-        print(f'Skipping {col} due to error: {e}')
+        print(f'Could not plot MCQ bar charts: {e}')
 
 # Heatmap for correlation between MCQ questions (using label encoding)
-from sklearn.preprocessing import LabelEncoder
+def correlation_heatmap(corr, title):
+    # Per-cell text labels are one SVG node each, so only label small matrices
+    texttemplate = '%{z:.2f}' if corr.shape[0] <= 15 else None
+    fig = go.Figure(go.Heatmap(z=corr.values, x=corr.columns, y=corr.index, colorscale='RdBu', zmin=-1, zmax=1, texttemplate=texttemplate))
+    fig.update_layout(title=title, yaxis_autorange='reversed')
+    return fig
+
 if mcq_cols:
     try:
-        mcq_encoded = df[mcq_cols].apply(lambda x: LabelEncoder().fit_transform(x.astype(str)))
-        corr = mcq_encoded.corr()
-        fig = px.imshow(corr, text_auto=True, title='Correlation Heatmap of MCQ Questions')
+        # Sorted factorize codes match LabelEncoder's output without one estimator per column
+        codes = np.column_stack([pd.factorize(df[col].astype(str), sort=True, use_na_sentinel=False)[0] for col in mcq_cols])
+        corr = pd.DataFrame(np.atleast_2d(np.corrcoef(codes, rowvar=False)), index=mcq_cols, columns=mcq_cols)
+        fig = correlation_heatmap(corr, 'Correlation Heatmap of MCQ Questions')
         if st:
             st.plotly_chart(fig, key=f"plotly_chart_{col}_heatmap")
         else:
@@ -162,7 +223,10 @@ for col in df.columns:
 if text_col and df[text_col].dropna().astype(str).str.len().sum() > 0:
     try:
         all_words = ' '.join(df[text_col].dropna().astype(str))
-        wordcloud = WordCloud(width=800, height=400, background_color='white').generate(all_words)
+        # Count words once and build the cloud from frequencies
+        tokens = re.findall(r"\w[\w']+", all_words.lower())
+        freqs = Counter(t for t in tokens if t not in STOPWORDS and not t.isdigit())
+        wordcloud = WordCloud(width=800, height=400, background_color='white', max_words=200).generate_from_frequencies(dict(freqs.most_common(200)))
         if st:
             from io import BytesIO
             buf = BytesIO()
@@ -181,15 +245,12 @@ else:
 
 # Sentiment trend over time (if sentiment and date available)
 sentiment_col = None
-date_col = None
+date_col = date_cols[0] if date_cols else None
 for col in df.columns:
     if 'sentiment' in col.lower():
         sentiment_col = col
-    if 'date' in col.lower() or 'timestamp' in col.lower():
-        date_col = col
 if sentiment_col and date_col:
     try:
-        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
         df_sorted = df.sort_values(date_col)
         if not df_sorted[sentiment_col].isnull().all():
             fig = px.line(df_sorted, x=date_col, y=sentiment_col, title='Sentiment Trend Over Time')
@@ -215,18 +276,15 @@ if st:
     st.write('Total responses:', len(df))
     if time_col:
         st.subheader('Completion Time Distribution')
-        st.plotly_chart(px.histogram(df, x=time_col, nbins=20, title='Completion Time Distribution'))
+        st.plotly_chart(prebinned_histogram(df[time_col], nbins=20, title='Completion Time Distribution'))
     if date_col:
         st.subheader('Response Count per Day')
-        daily_counts = df[date_col].dt.date.value_counts().sort_index()
         st.bar_chart(daily_counts)
-    for col in mcq_cols:
-        st.subheader(f'MCQ Bar Chart: {col}')
-        vc = df[col].value_counts(dropna=False).reset_index()
-        vc.columns = [col, 'Count']
-    st.plotly_chart(px.bar(vc, x=col, y='Count', title=f'Bar Chart: {col}', labels={col: col, 'Count': 'Count'}), key=f"plotly_chart_bar_{col}")
+    if mcq_cols:
+        st.subheader('MCQ Bar Charts')
+        st.plotly_chart(mcq_bar_grid(mcq_counts), key="plotly_chart_mcq_bar_grid")
     st.subheader('MCQ Correlation Heatmap')
-    st.plotly_chart(px.imshow(corr, text_auto=True, title='Correlation Heatmap of MCQ Questions'))
+    st.plotly_chart(correlation_heatmap(corr, 'Correlation Heatmap of MCQ Questions'))
     if text_col:
         st.subheader('WordCloud of Text Responses')
         from io import BytesIO
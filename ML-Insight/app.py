@@ -3,47 +3,86 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from wordcloud import WordCloud
-from sklearn.preprocessing import LabelEncoder
-from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
+from plotly.subplots import make_subplots
+from wordcloud import WordCloud, STOPWORDS
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
+from sklearn.decomposition import TruncatedSVD
+from sklearn.cluster import MiniBatchKMeans
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
 import json
 import io
+import os
+import re
+from collections import Counter
 import matplotlib.pyplot as plt
 import seaborn as sns
 import base64
 import warnings
 warnings.filterwarnings('ignore')
 
+# Optional: orjson for faster JSON parsing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ----------------------
 # Utility Functions
 # ----------------------
-def load_survey_data(uploaded_file=None):
-    if uploaded_file is not None:
-        data = json.load(uploaded_file)
-    else:
-        with open('survey-results-f5ae24e1-9985-450b-b36c-878ffa7f471d.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
+DEFAULT_SURVEY_FILE = 'survey-results-f5ae24e1-9985-450b-b36c-878ffa7f471d.json'
+SURVEY_META_KEYS = ('response_id', 'user_id', 'user_name', 'submitted_at', 'completion_time')
+# Share of non-null values that must parse before a name-matched column is treated
+# as a date, and before the ISO 8601 fast path is accepted without format inference
+DATE_PARSE_MIN_RATIO = 0.9
+
+def _parse_json_bytes(raw):
+    # Not cached itself: _build_df caches the finished DataFrame, and pickling
+    # the parsed document into a second cache costs more than orjson parsing it
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _is_json_lines(raw):
+    start = re.match(rb'\s*', raw).end()
+    end = raw.find(b'\n', start)
+    if end == -1:
+        return False
+    first = raw[start:end].strip()
+    # A complete object on the first line followed by another object
+    return first.startswith(b'{') and first.endswith(b'}') and raw.find(b'{', end) != -1
+
+def _answer_cols(flat):
+    # json_normalize names nested answers 'responses.<qid>'
+    return [col for col in flat.columns if col.startswith('responses.')]
+
+def _rename_answer_cols(df, answer_cols, qid_to_text):
+    rename_map = {col: qid_to_text.get(col[len('responses.'):], col[len('responses.'):]) for col in answer_cols}
+    return df.rename(columns=rename_map)
+
+def _read_json_lines(raw):
+    # One response per line: the bytes are already in memory, so parse each line
+    # and flatten them in one json_normalize call like the JSON export. Answers
+    # nested under 'responses' become one column per question, with the same
+    # column types as the JSON path
+    records = [_parse_json_bytes(line) for line in raw.splitlines() if line.strip()]
+    flat = pd.json_normalize(records)
+    # JSON-lines exports carry no question list, so answers keep their question IDs
+    return _rename_answer_cols(flat, _answer_cols(flat), {})
+
+def _survey_to_df(questions, responses):
+    # Map question IDs to text
+    qid_to_text = {q['question_id']: q['question_text'] for q in questions}
+    # Flatten all responses in one call; answers come out as 'responses.<qid>'
+    flat = pd.json_normalize(list(responses))
+    answer_cols = _answer_cols(flat)
+    df = flat.reindex(columns=list(SURVEY_META_KEYS) + answer_cols)
+    return _rename_answer_cols(df, answer_cols, qid_to_text)
+
+def _records_to_df(data):
     # Special handling for the provided survey JSON structure
     if isinstance(data, dict) and 'responses' in data and 'questions' in data:
-        # Map question IDs to text
-        qid_to_text = {q['question_id']: q['question_text'] for q in data['questions']}
-        qid_to_type = {q['question_id']: q['question_type'] for q in data['questions']}
-        records = []
-        for resp in data['responses']:
-            row = { 'response_id': resp.get('response_id'),
-                    'user_id': resp.get('user_id'),
-                    'user_name': resp.get('user_name'),
-                    'submitted_at': resp.get('submitted_at'),
-                    'completion_time': resp.get('completion_time') }
-            for qid, answer in resp['responses'].items():
-                col_name = qid_to_text.get(qid, qid)
-                row[col_name] = answer
-            records.append(row)
-        return pd.DataFrame(records)
+        return _survey_to_df(data['questions'], data['responses'])
     # Fallback for other structures
     if isinstance(data, dict):
         for key in ['responses', 'data', 'results', 'answers']:
@@ -58,13 +97,277 @@ def load_survey_data(uploaded_file=None):
         records = []
     return pd.DataFrame(records)
 
+def prebinned_histogram(values, nbins=20, title=None):
+    # Bin on the server so only the bin counts are sent to the browser
+    values = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy()
+    counts, edges = np.histogram(values, bins=nbins)
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+    fig.update_layout(title=title, yaxis_title='count', bargap=0)
+    return fig
+
+def mcq_bar_grid(mcq_counts, ncols=3):
+    # One subplot grid for every MCQ question: a single figure to serialize and render
+    nrows = (len(mcq_counts) + ncols - 1) // ncols
+    fig = make_subplots(rows=nrows, cols=ncols, subplot_titles=list(mcq_counts))
+    for i, (col, vc) in enumerate(mcq_counts.items()):
+        fig.add_bar(x=vc.index.astype(str), y=vc.values, name=col, row=i // ncols + 1, col=i % ncols + 1)
+    fig.update_layout(height=350 * nrows, showlegend=False)
+    return fig
+
+def cluster_scatter(X_pca, clusters):
+    if len(X_pca) > 5000:
+        # A fixed 5000-point sample keeps the plot responsive and stable across reruns
+        idx = np.random.default_rng(0).choice(len(X_pca), 5000, replace=False)
+        X_pca, clusters = X_pca[idx], clusters[idx]
+    if len(X_pca) > 2000:
+        # Large surveys: a single WebGL trace colored by cluster id
+        fig = go.Figure(go.Scattergl(x=X_pca[:,0], y=X_pca[:,1], mode='markers', marker=dict(color=clusters, colorscale='Viridis')))
+        fig.update_layout(title="KMeans Clusters (PCA)", xaxis_title='PC1', yaxis_title='PC2')
+        return fig
+    return px.scatter(x=X_pca[:,0], y=X_pca[:,1], color=clusters.astype(str), labels={'x': 'PC1', 'y': 'PC2', 'color': 'Cluster'}, title="KMeans Clusters (PCA)")
+
+def correlation_heatmap(corr, title):
+    # Per-cell text labels are one SVG node each, so only label small matrices
+    texttemplate = '%{z:.2f}' if corr.shape[0] <= 15 else None
+    fig = go.Figure(go.Heatmap(z=corr.values, x=corr.columns, y=corr.index, colorscale='RdBu', zmin=-1, zmax=1, texttemplate=texttemplate))
+    fig.update_layout(title=title, yaxis_autorange='reversed')
+    return fig
+
+def top_k_indices(values, k):
+    # Partition out the k largest in O(n), then sort only those k
+    k = min(k, len(values))
+    top = np.argpartition(values, -k)[-k:]
+    return top[np.argsort(-values[top])]
+
+def find_date_cols(df):
+    date_cols = [col for col in df.columns if 'date' in col.lower() or 'timestamp' in col.lower()]
+    if 'submitted_at' in df.columns:
+        # Listed first so the daily counts come from the submission time
+        date_cols.insert(0, 'submitted_at')
+    return date_cols
+
+def find_text_cols(df):
+    # One vectorized match over the lowercased column names
+    is_text = df.columns.astype(str).str.lower().str.contains('text|feedback|comment')
+    return df.columns[is_text].tolist()
+
+def _categorize_answers(df, text_cols):
+    # Low-cardinality answers become category dtype once, so value_counts,
+    # nunique and factorize work on integer codes instead of rehashing strings
+    obj_cols = [col for col in df.select_dtypes(include='object').columns if col not in text_cols]
+    try:
+        nunique = df[obj_cols].nunique()
+    except TypeError:
+        # Unhashable answers (e.g. lists) can't be categorized
+        return df
+    cat_cols = nunique[(nunique >= 2) & (nunique < 50)].index
+    return df.astype({col: 'category' for col in cat_cols})
+
+def _parse_dates(series):
+    # Date columns are usually ISO 8601; only fall back to format inference when
+    # the fast path misses a real share of the values, not a stray malformed one
+    parsed = pd.to_datetime(series, errors='coerce', utc=True, format='ISO8601')
+    if parsed.notna().sum() < DATE_PARSE_MIN_RATIO * series.notna().sum():
+        parsed = pd.to_datetime(series, errors='coerce', utc=True)
+    return parsed
+
+def _parse_date_cols(df, date_cols):
+    # Question columns can match by name too ("How often would you like updates?"),
+    # so only keep the columns whose values actually parse as dates
+    parsed = {}
+    for col in date_cols:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series):
+            continue
+        try:
+            dates = _parse_dates(series)
+        except (TypeError, ValueError):
+            continue
+        n_valid = series.notna().sum()
+        if n_valid and dates.notna().sum() >= DATE_PARSE_MIN_RATIO * n_valid:
+            parsed[col] = dates
+    return parsed
+
+@st.cache_data(show_spinner=False)
+def _build_df(raw):
+    if _is_json_lines(raw):
+        df = _read_json_lines(raw)
+    else:
+        df = _records_to_df(_parse_json_bytes(raw))
+    # Convert all date columns in a single assign and defragment once, rather
+    # than mutating columns in place from each section.
+    parsed_dates = _parse_date_cols(df, find_date_cols(df))
+    df = df.assign(**parsed_dates).copy()
+    text_cols = find_text_cols(df)
+    df = _categorize_answers(df, text_cols)
+    if parsed_dates:
+        # Stored as a plain dict: pandas compares attrs when combining frames,
+        # which a Series can't take part in
+        df.attrs['daily_counts'] = df[next(iter(parsed_dates))].dt.date.value_counts().sort_index().to_dict()
+    df.attrs['text_cols'] = text_cols
+    return df
+
+@st.cache_data(show_spinner=False)
+def _load_default_survey(path, mtime):
+    # Keyed on path and modification time so the bundled file is only read
+    # (and its bytes hashed) again when it changes on disk
+    with open(path, 'rb') as f:
+        return _build_df(f.read())
+
+def load_survey_data(uploaded_file=None):
+    # Streamlit reruns the whole script on every interaction, so parsing and
+    # DataFrame construction are cached on the raw file bytes.
+    if uploaded_file is not None:
+        return _build_df(uploaded_file.getvalue())
+    return _load_default_survey(DEFAULT_SURVEY_FILE, os.path.getmtime(DEFAULT_SURVEY_FILE))
+
+# ----------------------
+# Cached Computations
+# ----------------------
+@st.cache_data(show_spinner=False)
+def detect_mcq_cols(df):
+    obj_df = df.select_dtypes(include=['object', 'category'])
+    # One nunique pass over all answer columns instead of one call per column
+    try:
+        nunique = obj_df.nunique()
+    except TypeError:
+        # Unhashable answers (e.g. lists or dicts) can't be counted in one pass; check per column
+        mcq_cols = []
+        for col in obj_df.columns:
+            try:
+                if 2 <= obj_df[col].nunique() < 20:
+                    mcq_cols.append(col)
+            except TypeError:
+                continue
+        return mcq_cols
+    return nunique[(nunique >= 2) & (nunique < 20)].index.tolist()
+
+@st.cache_data(show_spinner=False)
+def mcq_correlation(mcq_df):
+    mcq_cols = mcq_df.columns.tolist()
+    # Sorted factorize codes match LabelEncoder's output without one estimator per column
+    codes = np.column_stack([pd.factorize(mcq_df[col].astype(str), sort=True, use_na_sentinel=False)[0] for col in mcq_cols])
+    corr = np.corrcoef(codes, rowvar=False)
+    return pd.DataFrame(np.atleast_2d(corr), index=mcq_cols, columns=mcq_cols)
+
+def encode_mcq(mcq_df):
+    # Sparse float32 one-hot matrix; missing answers get an explicit '__NA__'
+    # category like get_dummies(dummy_na=True)
+    encoder = OneHotEncoder(sparse_output=True, handle_unknown='ignore', dtype=np.float32)
+    return encoder.fit_transform(mcq_df.astype(object).fillna('__NA__').astype(str))
+
+@st.cache_data(show_spinner=False)
+def compute_mcq_clusters(mcq_df):
+    # Shared by MCQ Analytics and Dashboard Summary: whichever page runs first
+    # fills the cache and the other reuses the projection and labels
+    encoded = encode_mcq(mcq_df)
+    # TruncatedSVD and MiniBatchKMeans both work on the sparse matrix directly
+    svd = TruncatedSVD(n_components=2, random_state=42)
+    X_pca = svd.fit_transform(encoded)
+    kmeans = MiniBatchKMeans(n_clusters=3, batch_size=1024, n_init=3, random_state=42)
+    clusters = kmeans.fit_predict(encoded)
+    return X_pca, clusters
+
+@st.cache_data(show_spinner=False)
+def build_wordcloud_png(text):
+    # Count words once and hand WordCloud the frequencies, skipping its own
+    # tokenization and collocation pass over the full text
+    tokens = re.findall(r"\w[\w']+", text.lower())
+    freqs = Counter(t for t in tokens if t not in STOPWORDS and not t.isdigit())
+    wordcloud = WordCloud(width=800, height=400, background_color='white', max_words=200).generate_from_frequencies(dict(freqs.most_common(200)))
+    buf = io.BytesIO()
+    wordcloud.to_image().save(buf, format='PNG')
+    return buf.getvalue()
+
+@st.cache_resource(show_spinner=False)
+def train_rating_model(X_train, y_train, X_test, y_test):
+    # Ordinal codes with native categorical splits avoid the one-hot blowup;
+    # unseen answers map to -1, which the model treats as missing
+    encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+    X_train_enc = encoder.fit_transform(X_train.astype(str))
+    X_test_enc = encoder.transform(X_test.astype(str))
+    # Native categorical support is limited to max_bins categories per feature
+    categorical = (X_train.nunique(dropna=False) <= 255).to_numpy()
+    # Reweight classes when ratings are skewed rather than relying on the split alone
+    class_counts = y_train.value_counts()
+    class_weight = 'balanced' if class_counts.max() > 2 * class_counts.min() else None
+    clf = HistGradientBoostingClassifier(max_iter=200, categorical_features=categorical, class_weight=class_weight, random_state=42)
+    clf.fit(X_train_enc, y_train)
+    y_pred = clf.predict(X_test_enc)
+    # The model has no impurity importances; permute features on a bounded test sample
+    n_sample = min(len(X_test_enc), 2000)
+    sample = np.random.default_rng(42).choice(len(X_test_enc), n_sample, replace=False)
+    importances = permutation_importance(clf, X_test_enc[sample], y_test.iloc[sample], n_repeats=5, random_state=42).importances_mean
+    return clf, y_pred, importances
+
+@st.cache_resource(show_spinner=False)
+def _ensure_vader():
+    import nltk
+    # A local nltk_data folder next to the app is searched first; only download when the lexicon is missing everywhere
+    local_data = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')
+    if local_data not in nltk.data.path:
+        # Failed attempts aren't cached, so guard against adding the path on every retry
+        nltk.data.path.insert(0, local_data)
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        # nltk.download reports failure by returning False; raise instead so
+        # cache_resource doesn't keep the failed attempt and get_sia retries
+        if not nltk.download('vader_lexicon', quiet=True):
+            raise LookupError("could not download the VADER lexicon")
+
+@st.cache_resource(show_spinner=False)
+def get_sia():
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    _ensure_vader()
+    return SentimentIntensityAnalyzer()
+
+@st.cache_data(show_spinner=False)
+def compute_sentiments(texts):
+    sia = get_sia()
+    # Survey answers repeat a lot, so score each distinct text once and
+    # broadcast back; scoring goes straight into an array, skipping pandas apply
+    codes, unique_texts = pd.factorize(np.asarray(texts, dtype=object))
+    scores = np.fromiter((sia.polarity_scores(t)['compound'] for t in unique_texts), dtype=np.float64, count=len(unique_texts))
+    return scores[codes]
+
+@st.cache_resource(show_spinner=False)
+def fit_lda(texts):
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.decomposition import LatentDirichletAllocation
+    # Hashing is stateless, so no vocabulary has to be built and held in memory;
+    # norm=None keeps raw term counts for LDA. LDA keeps a dense topics x buckets
+    # matrix, so the bucket count stays small
+    vectorizer = HashingVectorizer(n_features=2**14, alternate_sign=False, norm=None, stop_words='english')
+    # Tokenize once: the same token lists feed the model and the bucket -> word map
+    analyzer = vectorizer.build_analyzer()
+    docs = [analyzer(text) for text in texts]
+    vectorizer.set_params(analyzer=lambda tokens: tokens)
+    dtm = vectorizer.transform(docs)
+    lda = LatentDirichletAllocation(n_components=5, random_state=42, learning_method='online', batch_size=256, n_jobs=-1)
+    lda.fit(dtm)
+    # Hashing is one-way, so map the buckets back to the words seen in the texts
+    bucket_words = sorted({token for tokens in docs for token in tokens})
+    if not bucket_words:
+        raise ValueError("no words left after removing stop words")
+    bucket_ids = vectorizer.transform([[word] for word in bucket_words]).indices
+    return lda, bucket_ids, bucket_words
+
+def extract_lda_topics(texts):
+    lda, bucket_ids, bucket_words = fit_lda(texts)
+    topics = []
+    for idx, topic in enumerate(lda.components_):
+        top_words = [bucket_words[i] for i in top_k_indices(topic[bucket_ids], 8)]
+        topics.append(f"Topic {idx+1}: " + ', '.join(top_words))
+    return topics
+
 # ----------------------
 # Sidebar
 # ----------------------
 st.set_page_config(page_title="Survey ML Dashboard", layout="wide")
 st.sidebar.title("📊 Survey ML Dashboard")
 
-uploaded_file = st.sidebar.file_uploader("Upload a new survey JSON file", type=["json"])
+uploaded_file = st.sidebar.file_uploader("Upload a new survey JSON file", type=["json", "jsonl"])
 df = load_survey_data(uploaded_file)
 
 menu = st.sidebar.radio("Navigation", [
@@ -78,6 +381,7 @@ menu = st.sidebar.radio("Navigation", [
 # ----------------------
 # Overview Section
 # ----------------------
+@st.fragment
 def show_overview(df):
     st.title("Overview ✅")
     st.markdown("""
@@ -86,19 +390,16 @@ def show_overview(df):
     st.write(f"**Total responses:** {len(df)}")
     # Completion rate and time
     time_col = next((col for col in df.columns if 'time' in col.lower() and ('complete' in col.lower() or 'duration' in col.lower())), None)
-    # Try to find a date column, fallback to 'submitted_at' if present
-    date_col = next((col for col in df.columns if 'date' in col.lower() or 'timestamp' in col.lower()), None)
-    if not date_col and 'submitted_at' in df.columns:
-        date_col = 'submitted_at'
+    # Responses per day are precomputed at load time from the first column that parsed as dates
+    daily_counts = df.attrs.get('daily_counts')
     if time_col:
         avg_time = df[time_col].dropna().mean()
         st.write(f"**Average completion time:** {avg_time:.1f} seconds")
     else:
         st.write("**Average completion time:** N/A")
-    if date_col:
-        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-        daily_counts = df[date_col].dt.date.value_counts().sort_index()
-        fig = px.line(x=daily_counts.index, y=daily_counts.values, labels={'x': 'Date', 'y': 'Responses'}, title="Responses Over Time")
+    if daily_counts is not None:
+        fig = go.Figure(go.Scatter(x=list(daily_counts.keys()), y=list(daily_counts.values()), mode='lines'))
+        fig.update_layout(title="Responses Over Time", xaxis_title='Date', yaxis_title='Responses')
         st.plotly_chart(fig, use_container_width=True)
         st.caption("Line chart: Number of survey responses submitted each day.")
     else:
@@ -107,33 +408,36 @@ def show_overview(df):
 # ----------------------
 # MCQ Analytics Section
 # ----------------------
+@st.fragment
 def show_mcq_analytics(df):
     st.title("MCQ Analytics 📊")
     st.markdown("""
     This section analyzes multiple-choice (MCQ) questions in your survey. It shows how often each answer was chosen, the percentage breakdown, relationships between questions, and clusters of similar respondents. Use it to identify popular and unpopular options, discover patterns and correlations, and segment respondents into groups for targeted insights.
     """)
-    from pandas.api.types import is_object_dtype
-    mcq_cols = [col for col in df.columns if is_object_dtype(df[col]) and 2 <= df[col].nunique() < 20]
+    mcq_cols = detect_mcq_cols(df)
     if not mcq_cols:
         st.warning("No MCQ columns found.")
         return
-    for col in mcq_cols:
-        counts = df[col].value_counts(dropna=False)
-        percentages = df[col].value_counts(normalize=True, dropna=False) * 100
-        freq_df = pd.DataFrame({'Count': counts, 'Percentage': percentages.round(2)})
-        st.subheader(f"{col}")
-        st.markdown(f"Frequency and percentage of each answer for: _{col}_")
-        st.dataframe(freq_df)
-        fig = px.bar(freq_df.reset_index(), x=col, y='Count', title=f"Bar Chart: {col}")
-        st.plotly_chart(fig, use_container_width=True)
-        st.caption("Bar chart: Number of responses for each option.")
+    mcq_counts = {col: df[col].value_counts(dropna=False) for col in mcq_cols}
+    st.plotly_chart(mcq_bar_grid(mcq_counts), use_container_width=True)
+    st.caption("Bar charts: Number of responses for each option.")
+    # Frequency tables are only rendered on request; toggling reruns just this fragment
+    if st.toggle("Show frequency tables", key="mcq_show_tables"):
+        grid = st.columns(3)
+        for i, (col, counts) in enumerate(mcq_counts.items()):
+            # Derive percentages from the counts instead of a second value_counts pass
+            percentages = (counts / counts.sum() * 100).round(2)
+            freq_df = pd.DataFrame({'Count': counts, 'Percentage': percentages})
+            with grid[i % 3]:
+                st.subheader(f"{col}")
+                st.markdown(f"Frequency and percentage of each answer for: _{col}_")
+                st.dataframe(freq_df)
     # Correlation heatmap
     st.subheader("Correlation Heatmap")
     st.markdown("Shows how answers to different MCQ questions are related. Darker colors mean stronger correlation.")
     try:
-        mcq_encoded = df[mcq_cols].apply(lambda x: LabelEncoder().fit_transform(x.astype(str)))
-        corr = mcq_encoded.corr()
-        fig = px.imshow(corr, text_auto=True, title='Correlation Heatmap of MCQ Questions')
+        corr = mcq_correlation(df[mcq_cols])
+        fig = correlation_heatmap(corr, 'Correlation Heatmap of MCQ Questions')
         st.plotly_chart(fig, use_container_width=True)
     except Exception as e:
         st.info(f"Could not plot MCQ correlation heatmap: {e}")
@@ -141,12 +445,8 @@ def show_mcq_analytics(df):
     st.subheader("Cluster Visualization (2D PCA)")
     st.markdown("Each dot is a respondent, colored by cluster. Clusters group people with similar answer patterns.")
     try:
-        encoded = pd.get_dummies(df[mcq_cols], dummy_na=True)
-        pca = PCA(n_components=2)
-        X_pca = pca.fit_transform(encoded)
-        kmeans = KMeans(n_clusters=3, random_state=42)
-        clusters = kmeans.fit_predict(encoded)
-        fig = px.scatter(x=X_pca[:,0], y=X_pca[:,1], color=clusters.astype(str), labels={'x': 'PC1', 'y': 'PC2', 'color': 'Cluster'}, title="KMeans Clusters (PCA)")
+        X_pca, clusters = compute_mcq_clusters(df[mcq_cols])
+        fig = cluster_scatter(X_pca, clusters)
         st.plotly_chart(fig, use_container_width=True)
     except Exception as e:
         st.info(f"Could not plot clusters: {e}")
@@ -154,6 +454,7 @@ def show_mcq_analytics(df):
 # ----------------------
 # Text Feedback (NLP) Section
 # ----------------------
+@st.fragment
 def show_text_feedback(df):
     st.title("Text Feedback (NLP) 💬")
     st.markdown("""
@@ -164,31 +465,25 @@ def show_text_feedback(df):
     Use it to quickly see what people are talking about and spot common concerns, suggestions, or praise.
     """)
     # Combine all text columns
-    text_cols = [col for col in df.columns if any(x in col.lower() for x in ['text', 'feedback', 'comment'])]
-    # Only keep text columns that have at least one non-empty value
-    text_cols = [col for col in text_cols if df[col].dropna().astype(str).str.strip().replace('nan','').str.len().sum() > 0]
-    combined_text = df[text_cols].astype(str).apply(lambda row: ' '.join([v for v in row if v and v.lower() != 'nan']), axis=1) if text_cols else pd.Series(dtype=str)
-    if combined_text.empty or combined_text.str.strip().replace('nan','').str.len().sum() == 0:
+    # Only keep text columns that have at least one value
+    text_cols = [col for col in df.attrs.get('text_cols', []) if df[col].notna().any()]
+    combined_text = df[text_cols].fillna('').astype(str).agg(' '.join, axis=1).str.strip() if text_cols else pd.Series(dtype=str)
+    if combined_text.str.len().sum() == 0:
         st.warning("No text feedback found in any text columns.")
         return
+    # One plain-string view of the feedback, shared by every analysis below
+    texts = tuple(combined_text)
     # WordCloud
     st.subheader("WordCloud of Feedback")
     st.caption("A visual summary of the most common words in all text feedback.")
-    all_words = ' '.join(combined_text.dropna().astype(str))
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(all_words)
-    buf = io.BytesIO()
-    wordcloud.to_image().save(buf, format='PNG')
-    st.image(buf.getvalue())
+    all_words = ' '.join(texts)
+    st.image(build_wordcloud_png(all_words))
     # Sentiment (simple rule-based)
     st.subheader("Sentiment Distribution")
     st.caption("Histogram: Distribution of sentiment scores (from negative to positive). Uses VADER sentiment analysis.")
     try:
-        from nltk.sentiment import SentimentIntensityAnalyzer
-        import nltk
-        nltk.download('vader_lexicon', quiet=True)
-        sia = SentimentIntensityAnalyzer()
-        sentiments = combined_text.dropna().astype(str).apply(lambda x: sia.polarity_scores(x)['compound'])
-        fig = px.histogram(sentiments, nbins=20, title="Sentiment Distribution (VADER)")
+        sentiments = compute_sentiments(texts)
+        fig = prebinned_histogram(sentiments, nbins=20, title="Sentiment Distribution (VADER)")
         st.plotly_chart(fig, use_container_width=True)
     except Exception as e:
         st.info(f"Could not compute sentiment: {e}")
@@ -196,17 +491,7 @@ def show_text_feedback(df):
     st.subheader("Topic Modeling (Top 5 Topics)")
     st.caption("Top 5 topics extracted from feedback using LDA topic modeling. Each topic is a group of keywords that often appear together.")
     try:
-        from sklearn.feature_extraction.text import CountVectorizer
-        from sklearn.decomposition import LatentDirichletAllocation
-        vectorizer = CountVectorizer(max_df=0.95, min_df=2, stop_words='english')
-        dtm = vectorizer.fit_transform(combined_text.dropna().astype(str))
-        lda = LatentDirichletAllocation(n_components=5, random_state=42)
-        lda.fit(dtm)
-        words = vectorizer.get_feature_names_out()
-        topics = []
-        for idx, topic in enumerate(lda.components_):
-            top_words = [words[i] for i in topic.argsort()[-8:][::-1]]
-            topics.append(f"Topic {idx+1}: " + ', '.join(top_words))
+        topics = extract_lda_topics(texts)
         for t in topics:
             st.markdown(f"- {t}")
     except Exception as e:
@@ -215,6 +500,7 @@ def show_text_feedback(df):
 # ----------------------
 # Predictive Modeling Section
 # ----------------------
+@st.fragment
 def show_predictive_modeling(df):
     st.title("Predictive Modeling 🤖")
     st.markdown("""
@@ -224,14 +510,13 @@ def show_predictive_modeling(df):
     # Use exact question text for target
     target_col = 'How would you rate the overall quality of the AI/ML session?'
     # Exclude all text columns from features
-    text_cols = [col for col in df.columns if any(x in col.lower() for x in ['text', 'feedback', 'comment'])]
+    text_cols = df.attrs.get('text_cols', [])
     if target_col not in df.columns:
         st.warning("No target column (overall quality) found.")
         return
-    feature_cols = [col for col in df.columns if col != target_col and col not in text_cols and df[col].dtype == 'object']
-    X_cat = pd.get_dummies(df[feature_cols], dummy_na=True) if feature_cols else pd.DataFrame()
+    feature_cols = [col for col in df.columns if col != target_col and col not in text_cols and (df[col].dtype == 'object' or isinstance(df[col].dtype, pd.CategoricalDtype))]
     y = df[target_col].astype(str)
-    if X_cat.shape[1] == 0:
+    if not feature_cols:
         st.warning("No categorical features for modeling.")
         return
     # If only one class, skip modeling
@@ -244,13 +529,11 @@ def show_predictive_modeling(df):
         st.warning("Each class in the target must have at least 2 samples for modeling. Current class counts: " + str(class_counts.to_dict()))
         return
     try:
-        X_train, X_test, y_train, y_test = train_test_split(X_cat, y, test_size=0.2, random_state=42, stratify=y)
+        X_train, X_test, y_train, y_test = train_test_split(df[feature_cols], y, test_size=0.2, random_state=42, stratify=y)
     except ValueError as e:
         st.warning(f"Could not split data for modeling: {e}")
         return
-    clf = RandomForestClassifier(n_estimators=100, random_state=42)
-    clf.fit(X_train, y_train)
-    y_pred = clf.predict(X_test)
+    clf, y_pred, importances = train_rating_model(X_train, y_train, X_test, y_test)
     # Classification report
     st.subheader("Classification Report")
     st.caption("Precision, recall, and F1-score for each rating class. Higher values mean better model performance.")
@@ -260,19 +543,19 @@ def show_predictive_modeling(df):
     st.subheader("Confusion Matrix")
     st.caption("Matrix showing how often the model predicted each class vs. the true class. Diagonal = correct predictions.")
     cm = confusion_matrix(y_test, y_pred, labels=clf.classes_)
-    fig = px.imshow(cm, text_auto=True, x=clf.classes_, y=clf.classes_, color_continuous_scale='Blues', title="Confusion Matrix")
+    fig = px.imshow(cm, text_auto=cm.shape[0] <= 10, x=clf.classes_, y=clf.classes_, color_continuous_scale='Blues', title="Confusion Matrix")
     st.plotly_chart(fig, use_container_width=True)
     # Feature importance
     st.subheader("Feature Importance")
-    st.caption("Top 10 most important features (MCQ answers) for predicting the overall rating.")
-    importances = clf.feature_importances_
-    indices = np.argsort(importances)[-10:][::-1]
-    fig = px.bar(x=[X_cat.columns[i] for i in indices], y=importances[indices], labels={'x': 'Feature', 'y': 'Importance'}, title="Top 10 Feature Importances")
+    st.caption("Top 10 most important features (MCQ questions) for predicting the overall rating, by permutation importance.")
+    indices = top_k_indices(importances, 10)
+    fig = px.bar(x=[feature_cols[i] for i in indices], y=importances[indices], labels={'x': 'Feature', 'y': 'Importance'}, title="Top 10 Feature Importances")
     st.plotly_chart(fig, use_container_width=True)
 
 # ----------------------
 # Dashboard Summary Section
 # ----------------------
+@st.fragment
 def show_dashboard_summary(df):
     st.title("Dashboard Summary 💡")
     st.markdown("""
@@ -288,27 +571,20 @@ def show_dashboard_summary(df):
     st.markdown("#### Executive Summary Charts")
     # Show a few summary charts if possible
     # 1. MCQ cluster plot
-    from pandas.api.types import is_object_dtype
-    mcq_cols = [col for col in df.columns if is_object_dtype(df[col]) and 2 <= df[col].nunique() < 20]
+    mcq_cols = detect_mcq_cols(df)
     if mcq_cols:
         try:
-            encoded = pd.get_dummies(df[mcq_cols], dummy_na=True)
-            pca = PCA(n_components=2)
-            X_pca = pca.fit_transform(encoded)
-            kmeans = KMeans(n_clusters=3, random_state=42)
-            clusters = kmeans.fit_predict(encoded)
-            fig = px.scatter(x=X_pca[:,0], y=X_pca[:,1], color=clusters.astype(str), labels={'x': 'PC1', 'y': 'PC2', 'color': 'Cluster'}, title="KMeans Clusters (PCA)")
+            X_pca, clusters = compute_mcq_clusters(df[mcq_cols])
+            fig = cluster_scatter(X_pca, clusters)
             st.plotly_chart(fig, use_container_width=True)
         except Exception:
             pass
     # 2. WordCloud
-    text_col = next((col for col in df.columns if any(x in col.lower() for x in ['text', 'feedback', 'comment'])), None)
-    if text_col and df[text_col].dropna().astype(str).str.len().sum() > 0:
-        all_words = ' '.join(df[text_col].dropna().astype(str))
-        wordcloud = WordCloud(width=800, height=400, background_color='white').generate(all_words)
-        buf = io.BytesIO()
-        wordcloud.to_image().save(buf, format='PNG')
-        st.image(buf.getvalue())
+    text_col = next(iter(df.attrs.get('text_cols', [])), None)
+    texts = df[text_col].dropna().astype(str) if text_col else pd.Series(dtype=str)
+    if texts.str.len().sum() > 0:
+        all_words = ' '.join(texts)
+        st.image(build_wordcloud_png(all_words))
     st.markdown("---")
     st.markdown("For full details, see the individual notebook sections.")
 